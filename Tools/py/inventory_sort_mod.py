@@ -7,58 +7,109 @@ the InventoryHUD and StorageChest assets and merging the sorting functionality.
 import os
 import sys
 import struct
-import shutil
 import re
+import functools
+import json
+from contextlib import ExitStack
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import hashlib
 
+from kit_io import map_file, decode_fstring, fast_copy, list_dir, copy_files
+
+try:
+    import ahocorasick
+except ImportError:
+    HAS_AHOCORASICK = False
+else:
+    HAS_AHOCORASICK = True
+
 SCRIPT_DIR = Path(__file__).parent
 MOD_KIT_ROOT = SCRIPT_DIR.parent.parent
 BMSEXPORT_PATH = MOD_KIT_ROOT / "quickbms" / "BmsExport" / "Dungeons" / "Content"
 PRECOOKED_PATH = MOD_KIT_ROOT / "Precooked" / "Content"
 DUNGEONS_PATH = MOD_KIT_ROOT / "Dungeons" / "Content"
 
+# Source assets read by the analysis and patch steps
+INVENTORY_HUD_UASSET = BMSEXPORT_PATH / "UI" / "Inventory" / "UMG_InventoryHUD.uasset"
+INVENTORY_HUD_UEXP = BMSEXPORT_PATH / "UI" / "Inventory" / "UMG_InventoryHUD.uexp"
+STORAGE_CONTENT_UEXP = BMSEXPORT_PATH / "Content_Season2" / "UI" / "Merchant" / "UMG_StorageChestMerchantContent.uexp"
+
+# Where create_patched_inventory puts the base InventoryHUD files
+PRECOOKED_INVENTORY_PATH = PRECOOKED_PATH / "UI" / "Inventory"
+
+# Results of the last analysis run, kept out of Precooked/ so it never
+# gets copied into the pak
+ANALYSIS_CACHE_PATH = SCRIPT_DIR / "inventory_sort_mod.cache.json"
+
+# Filter-related patterns in the InventoryHUD uexp (where the actual widget data is)
+FILTER_PATTERNS = (
+    b'FiltersRow',
+    b'FiltersScale',
+    b'FilterButton',
+    b'FilterAll',
+    b'FilterArmor',
+    b'FilterMelee',
+    b'FilterRanged',
+)
+
+# Precompiled little-endian formats
+_I8 = struct.Struct('<b')
+_U8 = struct.Struct('<B')
+_I32 = struct.Struct('<i')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_U64 = struct.Struct('<Q')
+
+# Runs of printable ASCII, used to pull readable strings out of binaries
+_ASCII_STR4 = re.compile(rb'[\x20-\x7e]{4,}')
+_ASCII_STR3 = re.compile(rb'[\x20-\x7e]{3,}')
+
 
 class ByteBuffer:
     """Helper class for reading/writing binary data"""
 
     def __init__(self, data: bytes = b''):
-        self.data = bytearray(data)
+        # Any buffer (bytes, bytearray, mmap) is read in place, a private
+        # bytearray copy is only made on the first write
+        self.data = data
+        self._owned = False
+        # Reads go through a view so they never copy slices of the buffer
+        self.mv = memoryview(self.data)
         self.pos = 0
 
     def read_int8(self) -> int:
-        val = struct.unpack('<b', self.data[self.pos:self.pos + 1])[0]
+        val = _I8.unpack_from(self.mv, self.pos)[0]
         self.pos += 1
         return val
 
     def read_uint8(self) -> int:
-        val = struct.unpack('<B', self.data[self.pos:self.pos + 1])[0]
+        val = _U8.unpack_from(self.mv, self.pos)[0]
         self.pos += 1
         return val
 
     def read_int32(self) -> int:
-        val = struct.unpack('<i', self.data[self.pos:self.pos + 4])[0]
+        val = _I32.unpack_from(self.mv, self.pos)[0]
         self.pos += 4
         return val
 
     def read_uint32(self) -> int:
-        val = struct.unpack('<I', self.data[self.pos:self.pos + 4])[0]
+        val = _U32.unpack_from(self.mv, self.pos)[0]
         self.pos += 4
         return val
 
     def read_int64(self) -> int:
-        val = struct.unpack('<q', self.data[self.pos:self.pos + 8])[0]
+        val = _I64.unpack_from(self.mv, self.pos)[0]
         self.pos += 8
         return val
 
     def read_uint64(self) -> int:
-        val = struct.unpack('<Q', self.data[self.pos:self.pos + 8])[0]
+        val = _U64.unpack_from(self.mv, self.pos)[0]
         self.pos += 8
         return val
 
     def read_bytes(self, count: int) -> bytes:
-        val = bytes(self.data[self.pos:self.pos + count])
+        val = bytes(self.mv[self.pos:self.pos + count])
         self.pos += count
         return val
 
@@ -68,26 +119,31 @@ class ByteBuffer:
         if length == 0:
             return ""
 
-        is_utf16 = length < 0
-        if is_utf16:
-            length = -length
-            data = self.read_bytes(length * 2)
-            return data.decode('utf-16-le', errors='ignore').rstrip('\x00')
-        else:
-            data = self.read_bytes(length)
-            return data.decode('utf-8', errors='ignore').rstrip('\x00')
+        # Negative lengths count UTF-16 characters
+        width = 2 if length < 0 else 1
+        data = self.read_bytes(abs(length) * width)
+        return decode_fstring(data, width)
+
+    def _extend(self, data: bytes):
+        # A bytearray can't be resized while a view of it is alive
+        self.mv.release()
+        if not self._owned:
+            self.data = bytearray(self.data)
+            self._owned = True
+        self.data.extend(data)
+        self.mv = memoryview(self.data)
 
     def write_int32(self, val: int):
-        self.data.extend(struct.pack('<i', val))
+        self._extend(_I32.pack(val))
 
     def write_uint32(self, val: int):
-        self.data.extend(struct.pack('<I', val))
+        self._extend(_U32.pack(val))
 
     def write_int64(self, val: int):
-        self.data.extend(struct.pack('<q', val))
+        self._extend(_I64.pack(val))
 
     def write_bytes(self, data: bytes):
-        self.data.extend(data)
+        self._extend(data)
 
     def seek(self, pos: int):
         self.pos = pos
@@ -95,34 +151,145 @@ class ByteBuffer:
     def tell(self) -> int:
         return self.pos
 
+    def release(self):
+        """Drop the view of the buffer so an mmap behind it can be closed"""
+        self.mv.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
 
 def extract_strings_from_uasset(filepath: Path) -> List[str]:
     """Extract all readable strings from a uasset file"""
-    with open(filepath, 'rb') as f:
-        data = f.read()
-
-    # Find ASCII strings
-    strings = re.findall(rb'[\x20-\x7e]{4,}', data)
+    with map_file(filepath) as data:
+        # Find ASCII strings
+        strings = _ASCII_STR4.findall(data)
     return [s.decode('ascii', errors='ignore') for s in strings]
 
 
 def find_pattern_in_binary(data: bytes, pattern: bytes, mask: bytes = None) -> List[int]:
     """Find all occurrences of a pattern with optional mask"""
-    if mask is None:
-        return [i for i in range(len(data) - len(pattern)) if data[i:i + len(pattern)] == pattern]
-
     results = []
-    for i in range(len(data) - len(pattern)):
-        match = True
-        for j, (p, m) in enumerate(zip(pattern, mask)):
-            if m == 0xFF and data[i + j] != p:
-                match = False
+    if mask is None:
+        start = 0
+        while True:
+            pos = data.find(pattern, start)
+            if pos == -1:
                 break
-        if match:
+            results.append(pos)
+            start = pos + 1
+        return results
+
+    # Only bytes under a 0xFF mask have to match
+    fixed = [j for j, m in enumerate(mask[:len(pattern)]) if m == 0xFF]
+    if not fixed:
+        return list(range(len(data) - len(pattern) + 1))
+
+    # Seed candidates with the first contiguous run of fixed bytes so the
+    # scan itself happens in C, then verify the remaining fixed bytes
+    run_start = fixed[0]
+    run_end = run_start + 1
+    while run_end < len(pattern) and run_end < len(mask) and mask[run_end] == 0xFF:
+        run_end += 1
+    seed = bytes(pattern[run_start:run_end])
+    rest = [j for j in fixed if j >= run_end]
+    last = len(data) - len(pattern)
+
+    start = run_start
+    while True:
+        pos = data.find(seed, start)
+        if pos == -1:
+            break
+        i = pos - run_start
+        if i > last:
+            break
+        if all(data[i + j] == pattern[j] for j in rest):
             results.append(i)
+        start = pos + 1
     return results
 
 
+@functools.lru_cache(maxsize=None)
+def _alternation(patterns: Tuple[bytes, ...]):
+    """Compile patterns into one regex that reports every start offset"""
+    # The leading lookahead only stops the scan where some pattern starts,
+    # then each pattern gets its own optional zero-width group so patterns
+    # sharing a start offset (one a prefix of another) are all reported
+    any_pattern = b'|'.join(re.escape(p) for p in patterns)
+    groups = b''.join(b'(?:(?=(' + re.escape(p) + b')))?' for p in patterns)
+    return re.compile(b'(?=' + any_pattern + b')' + groups)
+
+
+def find_all_patterns(data: bytes, patterns: List[bytes]) -> Dict[bytes, List[int]]:
+    """
+    Find all occurrences of several patterns in a single pass.
+
+    Uses an Aho-Corasick automaton when pyahocorasick is installed,
+    otherwise one combined regex. Both report every pattern at every
+    offset, overlapping hits included.
+    """
+    positions = {pattern: [] for pattern in patterns}
+
+    if not HAS_AHOCORASICK:
+        unique = tuple(positions)
+        for match in _alternation(unique).finditer(data):
+            for group, pattern in enumerate(unique, 1):
+                if match.start(group) != -1:
+                    positions[pattern].append(match.start())
+        return positions
+
+    # The default pyahocorasick build only accepts str keys, latin-1 maps
+    # every byte to the code point of the same value so offsets still line up
+    unicode_build = getattr(ahocorasick, 'unicode', True)
+    automaton = ahocorasick.Automaton()
+    for pattern in patterns:
+        automaton.add_word(pattern.decode('latin-1') if unicode_build else pattern, pattern)
+    automaton.make_automaton()
+
+    # Decode straight from the buffer so a mapped file is copied only once,
+    # the bytes build only accepts a real bytes object
+    haystack = str(data, 'latin-1') if unicode_build else bytes(data)
+    for end_idx, pattern in automaton.iter(haystack):
+        positions[pattern].append(end_idx - len(pattern) + 1)
+    for found in positions.values():
+        found.sort()
+    return positions
+
+
+def first_occurrence(filepath, needle: bytes, chunk_size: int = 1 << 20) -> int:
+    """
+    Offset of the first occurrence of needle in a file, or -1.
+    The file is streamed in chunks and the search stops at the first hit,
+    so memory use stays at one chunk regardless of the file size.
+    """
+    overlap = len(needle) - 1
+    offset = 0  # file offset of the start of buf
+    tail = b''
+    with open(filepath, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return -1
+            buf = tail + chunk
+            pos = buf.find(needle)
+            if pos >= 0:
+                return offset + pos
+            # Carry the end over so a match spanning two chunks is still found
+            tail = buf[-overlap:] if overlap else b''
+            offset += len(buf) - len(tail)
+
+
+def _up_to_date(jobs):
+    """True if every destination exists and is at least as new as its source"""
+    try:
+        return all(os.stat(dst).st_mtime >= os.stat(src).st_mtime for src, dst in jobs)
+    except FileNotFoundError:
+        return False
+
+
 def copy_required_files():
     """Copy all files required for the sorting functionality"""
 
@@ -130,6 +297,8 @@ def copy_required_files():
     print("COPYING REQUIRED FILES")
     print("=" * 60)
 
+    jobs = []
+
     # Files from Content_Season3/UI/StorageChest
     storage_chest_files = [
         "UMG_SortSelectionPicker",
@@ -138,17 +307,15 @@ def copy_required_files():
         "UMG_ExpandingListItem",
     ]
 
-    for filename in storage_chest_files:
-        src_dir = BMSEXPORT_PATH / "Content_Season3" / "UI" / "StorageChest"
-        dst_dir = DUNGEONS_PATH / "Content_Season3" / "UI" / "StorageChest"
-        dst_dir.mkdir(parents=True, exist_ok=True)
+    src_dir = str(BMSEXPORT_PATH / "Content_Season3" / "UI" / "StorageChest")
+    dst_dir = str(DUNGEONS_PATH / "Content_Season3" / "UI" / "StorageChest")
+    present = list_dir(src_dir)
 
+    for filename in storage_chest_files:
         for ext in ['.uasset', '.uexp']:
-            src = src_dir / f"{filename}{ext}"
-            dst = dst_dir / f"{filename}{ext}"
-            if src.exists():
-                shutil.copy2(src, dst)
-                print(f"  ✓ {dst.relative_to(MOD_KIT_ROOT)}")
+            name = f"{filename}{ext}"
+            if os.path.normcase(name) in present:
+                jobs.append((os.path.join(src_dir, name), os.path.join(dst_dir, name)))
 
     # Files from UI/Merchant for sorting logic
     merchant_files = [
@@ -158,17 +325,15 @@ def copy_required_files():
     ]
 
     for src_rel, dst_rel in merchant_files:
-        src_dir = BMSEXPORT_PATH / Path(src_rel).parent
-        dst_dir = DUNGEONS_PATH / Path(dst_rel).parent
-        dst_dir.mkdir(parents=True, exist_ok=True)
+        src_dir = str(BMSEXPORT_PATH / Path(src_rel).parent)
+        dst_dir = str(DUNGEONS_PATH / Path(dst_rel).parent)
+        present = list_dir(src_dir)
 
         filename = Path(src_rel).name
         for ext in ['.uasset', '.uexp']:
-            src = src_dir / f"{filename}{ext}"
-            dst = dst_dir / f"{filename}{ext}"
-            if src.exists():
-                shutil.copy2(src, dst)
-                print(f"  ✓ {dst.relative_to(MOD_KIT_ROOT)}")
+            name = f"{filename}{ext}"
+            if os.path.normcase(name) in present:
+                jobs.append((os.path.join(src_dir, name), os.path.join(dst_dir, name)))
 
     # Audio files for sort sound effects
     audio_files = [
@@ -176,53 +341,44 @@ def copy_required_files():
     ]
 
     for audio_rel in audio_files:
-        src_dir = BMSEXPORT_PATH / Path(audio_rel).parent
-        dst_dir = DUNGEONS_PATH / Path(audio_rel).parent
-        dst_dir.mkdir(parents=True, exist_ok=True)
+        src_dir = str(BMSEXPORT_PATH / Path(audio_rel).parent)
+        dst_dir = str(DUNGEONS_PATH / Path(audio_rel).parent)
+        present = list_dir(src_dir)
 
         filename = Path(audio_rel).name
         for ext in ['.uasset', '.uexp']:
-            src = src_dir / f"{filename}{ext}"
-            dst = dst_dir / f"{filename}{ext}"
-            if src.exists():
-                shutil.copy2(src, dst)
-                print(f"  ✓ {dst.relative_to(MOD_KIT_ROOT)}")
+            name = f"{filename}{ext}"
+            if os.path.normcase(name) in present:
+                jobs.append((os.path.join(src_dir, name), os.path.join(dst_dir, name)))
 
+    # copy2 keeps the source mtime, so untouched sources compare equal
+    if jobs and _up_to_date(jobs):
+        print("  ✓ All files up to date")
+        return
 
-def analyze_filter_section():
-    """Analyze the filter section of InventoryHUD to understand where to add sort"""
+    copy_files(jobs)
+    for _, dst in jobs:
+        print(f"  ✓ {os.path.relpath(dst, MOD_KIT_ROOT)}")
+
+
+def analyze_filter_section(uexp_data: bytes, hits: Dict[bytes, List[int]]) -> int:
+    """
+    Analyze the filter section of InventoryHUD to understand where to add sort.
+    hits is the find_all_patterns result for FILTER_PATTERNS over uexp_data.
+    """
 
     print("\n" + "=" * 60)
     print("ANALYZING INVENTORY HUD FILTER SECTION")
     print("=" * 60)
 
-    inv_uasset = BMSEXPORT_PATH / "UI" / "Inventory" / "UMG_InventoryHUD.uasset"
-    inv_uexp = BMSEXPORT_PATH / "UI" / "Inventory" / "UMG_InventoryHUD.uexp"
-
-    with open(inv_uasset, 'rb') as f:
-        uasset_data = f.read()
-    with open(inv_uexp, 'rb') as f:
-        uexp_data = f.read()
-
-    # Find filter-related patterns in uexp (where the actual widget data is)
-    filter_patterns = [
-        b'FiltersRow',
-        b'FiltersScale',
-        b'FilterButton',
-        b'FilterAll',
-        b'FilterArmor',
-        b'FilterMelee',
-        b'FilterRanged',
-    ]
-
     print("\nFilter-related locations in uexp:")
-    for pattern in filter_patterns:
-        positions = find_pattern_in_binary(uexp_data, pattern)
+    for pattern in FILTER_PATTERNS:
+        positions = hits[pattern]
         if positions:
             print(f"  {pattern.decode()}: found at {positions[:3]}...")
 
     # Find the FiltersRow widget - this is where we'd want to add sorting
-    filters_row_pos = uexp_data.find(b'FiltersRow')
+    filters_row_pos = hits[b'FiltersRow'][0] if hits[b'FiltersRow'] else -1
     if filters_row_pos >= 0:
         print(f"\n  FiltersRow found at offset 0x{filters_row_pos:X}")
         # Show context around it
@@ -230,15 +386,16 @@ def analyze_filter_section():
         context = uexp_data[context_start:filters_row_pos + 200]
 
         # Extract readable strings from context
-        strings = re.findall(rb'[\x20-\x7e]{3,}', context)
+        strings = _ASCII_STR3.findall(context)
         print(f"  Context strings: {[s.decode() for s in strings[:10]]}")
 
     return filters_row_pos
 
 
-def create_patched_inventory():
+def create_patched_inventory(uasset_data: bytes, hits: Dict[bytes, List[int]]) -> bool:
     """
     Create a patched version of the inventory that includes sorting.
+    hits is the find_all_patterns result for FILTER_PATTERNS over the uexp.
 
     This uses a hex patching approach to add the sort picker widget
     to the filter row in the inventory HUD.
@@ -248,48 +405,35 @@ def create_patched_inventory():
     print("CREATING PATCHED INVENTORY HUD")
     print("=" * 60)
 
-    # Source files
-    inv_uasset = BMSEXPORT_PATH / "UI" / "Inventory" / "UMG_InventoryHUD.uasset"
-    inv_uexp = BMSEXPORT_PATH / "UI" / "Inventory" / "UMG_InventoryHUD.uexp"
-
-    # Reference: Storage chest which has sorting
-    storage_uasset = BMSEXPORT_PATH / "Content_Season2" / "UI" / "Merchant" / "UMG_StorageChestMerchantContent.uasset"
-    storage_uexp = BMSEXPORT_PATH / "Content_Season2" / "UI" / "Merchant" / "UMG_StorageChestMerchantContent.uexp"
-
     # Output
-    out_dir = PRECOOKED_PATH / "UI" / "Inventory"
+    out_dir = PRECOOKED_INVENTORY_PATH
     out_dir.mkdir(parents=True, exist_ok=True)
 
     # Copy original files
-    shutil.copy2(inv_uasset, out_dir / "UMG_InventoryHUD.uasset")
-    shutil.copy2(inv_uexp, out_dir / "UMG_InventoryHUD.uexp")
+    fast_copy(INVENTORY_HUD_UASSET, out_dir / "UMG_InventoryHUD.uasset")
+    fast_copy(INVENTORY_HUD_UEXP, out_dir / "UMG_InventoryHUD.uexp")
 
     print(f"  ✓ Copied base files to {out_dir.relative_to(MOD_KIT_ROOT)}")
 
-    # Read the files
-    with open(inv_uasset, 'rb') as f:
-        uasset_data = bytearray(f.read())
-    with open(inv_uexp, 'rb') as f:
-        uexp_data = bytearray(f.read())
-
-    # Also read storage chest for reference
-    with open(storage_uexp, 'rb') as f:
-        storage_uexp_data = f.read()
-
     # Find the sort picker reference pattern in storage chest
     sort_picker_pattern = b'UMG_SortSelectionPicker'
-    storage_sort_pos = storage_uexp_data.find(sort_picker_pattern)
+    storage_sort_pos = first_occurrence(STORAGE_CONTENT_UEXP, sort_picker_pattern)
     if storage_sort_pos >= 0:
         print(f"\n  Reference: Sort picker in storage chest at 0x{storage_sort_pos:X}")
         # Extract the widget instantiation pattern
-        context = storage_uexp_data[storage_sort_pos - 200:storage_sort_pos + 200]
+        context_start = max(0, storage_sort_pos - 200)
+        with open(STORAGE_CONTENT_UEXP, 'rb') as f:
+            f.seek(context_start)
+            context = f.read(storage_sort_pos + 200 - context_start)
         print(f"  Context size: {len(context)} bytes")
 
     # The challenge: UE4 widget hierarchies are complex binary structures
     # We need to find where FilterButtons are created and add a sort button
 
     # Find FilterAll button creation - this is where filter buttons start
-    filter_all_pos = uexp_data.find(b'FilterAll')
+    # (already located by the filter section scan)
+    found = hits[b'FilterAll']
+    filter_all_pos = found[0] if found else -1
     if filter_all_pos >= 0:
         print(f"\n  FilterAll found at offset 0x{filter_all_pos:X}")
 
@@ -302,19 +446,20 @@ def create_patched_inventory():
 
     print("\n  Adding name references...")
 
-    # Parse current name table
-    buf = ByteBuffer(uasset_data)
-    buf.seek(0)
+    # Parse current name table; the with block drops the view of the mapped
+    # file even if a read fails, so the caller can still close the map
+    with ByteBuffer(uasset_data) as buf:
+        buf.seek(0)
 
-    magic = buf.read_uint32()
-    if magic != 0x9E2A83C1:
-        print(f"  Error: Invalid magic {hex(magic)}")
-        return False
+        magic = buf.read_uint32()
+        if magic != 0x9E2A83C1:
+            print(f"  Error: Invalid magic {hex(magic)}")
+            return False
 
-    # Skip to name count/offset (at offset 41)
-    buf.seek(41)
-    name_count = buf.read_int32()
-    name_offset = buf.read_int32()
+        # Skip to name count/offset (at offset 41)
+        buf.seek(41)
+        name_count = buf.read_int32()
+        name_offset = buf.read_int32()
 
     print(f"  Current name count: {name_count}")
     print(f"  Name table offset: 0x{name_offset:X}")
@@ -336,6 +481,48 @@ def create_patched_inventory():
     return True
 
 
+def _analysis_sources() -> Dict[str, int]:
+    """Modification times of every file the analysis and patch steps read"""
+    return {str(path): os.stat(path).st_mtime_ns
+            for path in (INVENTORY_HUD_UASSET, INVENTORY_HUD_UEXP, STORAGE_CONTENT_UEXP)}
+
+
+def load_analysis_cache() -> Optional[dict]:
+    """
+    Results of the last analysis run, or None if it has to run again
+    because a source changed or the Precooked files are missing or stale.
+    """
+    try:
+        with open(ANALYSIS_CACHE_PATH, 'r') as f:
+            cache = json.load(f)
+        sources = _analysis_sources()
+    except (OSError, ValueError):
+        return None
+
+    # A cache of the wrong shape is treated like a missing one
+    if not isinstance(cache, dict) or not isinstance(cache.get('filters_row_pos'), int):
+        return None
+    if cache.get('sources') != sources:
+        return None
+
+    outputs = [(INVENTORY_HUD_UASSET, PRECOOKED_INVENTORY_PATH / "UMG_InventoryHUD.uasset"),
+               (INVENTORY_HUD_UEXP, PRECOOKED_INVENTORY_PATH / "UMG_InventoryHUD.uexp")]
+    if not _up_to_date(outputs):
+        return None
+
+    return cache
+
+
+def save_analysis_cache(filters_row_pos: int):
+    """Record the analysis results together with the source mtimes they came from"""
+    cache = {
+        'sources': _analysis_sources(),
+        'filters_row_pos': filters_row_pos,
+    }
+    with open(ANALYSIS_CACHE_PATH, 'w') as f:
+        json.dump(cache, f, indent=2)
+
+
 def create_blueprint_replacement():
     """
     Alternative approach: Create a completely new inventory HUD blueprint
@@ -402,11 +589,33 @@ def main():
     # Step 1: Copy all required supporting files
     copy_required_files()
 
-    # Step 2: Analyze the inventory structure
-    analyze_filter_section()
-
-    # Step 3: Create patched inventory (partial)
-    create_patched_inventory()
+    cache = load_analysis_cache()
+    if cache is not None:
+        # Nothing changed since the last run, so steps 2 and 3 would
+        # produce the same files again
+        print("\n" + "=" * 60)
+        print("INVENTORY HUD UP TO DATE")
+        print("=" * 60)
+        if cache['filters_row_pos'] >= 0:
+            print(f"  FiltersRow found at offset 0x{cache['filters_row_pos']:X}")
+        print(f"  Delete {ANALYSIS_CACHE_PATH.name} to force a full run")
+    else:
+        # Map each source once and share it between the analysis and patch steps
+        with ExitStack() as stack:
+            uasset_data = stack.enter_context(map_file(INVENTORY_HUD_UASSET))
+            uexp_data = stack.enter_context(map_file(INVENTORY_HUD_UEXP))
+
+            # Scan for every filter pattern in one pass and share the hits
+            hits = find_all_patterns(uexp_data, FILTER_PATTERNS)
+
+            # Step 2: Analyze the inventory structure
+            filters_row_pos = analyze_filter_section(uexp_data, hits)
+
+            # Step 3: Create patched inventory (partial)
+            patched = create_patched_inventory(uasset_data, hits)
+
+        if patched:
+            save_analysis_cache(filters_row_pos)
 
     # Step 4: Provide blueprint replacement instructions
     create_blueprint_replacement()
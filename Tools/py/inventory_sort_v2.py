@@ -7,44 +7,61 @@ with modified versions that include sorting.
 import os
 import sys
 import struct
-import shutil
+from contextlib import ExitStack
 from pathlib import Path
 
+from kit_io import map_file, decode_fstring, list_dir, copy_files
+
 SCRIPT_DIR = Path(__file__).parent
 MOD_KIT_ROOT = SCRIPT_DIR.parent.parent
 BMSEXPORT_PATH = MOD_KIT_ROOT / "quickbms" / "BmsExport" / "Dungeons" / "Content"
 PRECOOKED_PATH = MOD_KIT_ROOT / "Precooked" / "Content"
 DUNGEONS_PATH = MOD_KIT_ROOT / "Dungeons" / "Content"
 
+# Enough of the package summary to cover every header field used here
+HEADER_SIZE = 128
 
-def read_name_table(uasset_path):
-    """Read the name table from a uasset file"""
-    with open(uasset_path, 'rb') as f:
-        data = f.read()
+# Precompiled little-endian formats
+_I32 = struct.Struct('<i')
+_U32 = struct.Struct('<I')
 
-    name_count = struct.unpack('<i', data[41:45])[0]
-    name_offset = struct.unpack('<i', data[45:49])[0]
-
-    pos = name_offset
-    names = []
-    for i in range(min(name_count, 5000)):
-        if pos >= len(data) - 4:
-            break
-        str_len = struct.unpack('<i', data[pos:pos + 4])[0]
-        pos += 4
-        if str_len < 0:
-            str_len = -str_len
-            name = data[pos:pos + str_len * 2].decode('utf-16-le', errors='ignore').rstrip('\x00')
-            pos += str_len * 2
-        elif 0 < str_len < 1000:
-            name = data[pos:pos + str_len].decode('utf-8', errors='ignore').rstrip('\x00')
-            pos += str_len
-        else:
-            break
-        names.append(name)
-        pos += 4  # hash
 
-    return names, data
+def read_name_table(uasset_path):
+    """
+    Read the name table from a uasset file.
+    Returns the names and the file offset just past the name table.
+    """
+    with open(uasset_path, 'rb') as f:
+        # Only the summary header and the name table itself are read,
+        # never the rest of the file
+        header = f.read(HEADER_SIZE)
+        if len(header) < 49:
+            return [], len(header)
+
+        name_count = _I32.unpack_from(header, 41)[0]
+        name_offset = _I32.unpack_from(header, 45)[0]
+
+        f.seek(name_offset)
+        names = []
+        for i in range(min(name_count, 5000)):
+            entry_start = f.tell()
+            prefix = f.read(4)
+            if len(prefix) < 4:
+                f.seek(entry_start)
+                break
+            str_len = _I32.unpack(prefix)[0]
+            if str_len == 0 or str_len >= 1000:
+                break
+            width = 2 if str_len < 0 else 1
+            size = abs(str_len) * width
+            raw = f.read(size)
+            # A truncated entry ends the table, the offset stays at its start
+            if len(raw) < size or len(f.read(4)) < 4:  # hash
+                f.seek(entry_start)
+                break
+            names.append(decode_fstring(raw, width))
+
+        return names, f.tell()
 
 
 def find_bytes_pattern(data, pattern):
@@ -60,47 +77,68 @@ def find_bytes_pattern(data, pattern):
     return results
 
 
-def patch_uasset_names(uasset_data, names_to_add):
+def name_hash(name):
+    """Simple FNV-1a style hash of the lowercased name (zero seed)"""
+    lowered = name.lower()
+    # For ASCII names the encoded bytes are the code points, and iterating
+    # bytes yields ints directly instead of one-char strings through ord()
+    units = lowered.encode('ascii') if lowered.isascii() else map(ord, lowered)
+    h = 0
+    for c in units:
+        h = ((h ^ c) * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def scan_name_table(data, decode_names=False):
     """
-    Add new names to a uasset file's name table.
-    Returns the modified data and a mapping of new name indices.
+    Walk the name table of in-memory uasset data.
+    Returns (name_count, name_offset, name_table_end, names); names is
+    only decoded when decode_names is set and is None otherwise.
     """
-    data = bytearray(uasset_data)
-
-    # Read header info
-    name_count = struct.unpack('<i', data[41:45])[0]
-    name_offset = struct.unpack('<i', data[45:49])[0]
+    name_count = _I32.unpack_from(data, 41)[0]
+    name_offset = _I32.unpack_from(data, 45)[0]
 
-    # Find the end of the name table
     pos = name_offset
+    limit = len(data) - 4
+    names = [] if decode_names else None
     for i in range(name_count):
-        if pos >= len(data) - 4:
+        if pos >= limit:
             break
-        str_len = struct.unpack('<i', data[pos:pos + 4])[0]
+        str_len = _I32.unpack_from(data, pos)[0]
+        width = 2 if str_len < 0 else 1
+        byte_len = abs(str_len) * width
         pos += 4
-        if str_len < 0:
-            pos += (-str_len) * 2
-        elif str_len > 0:
-            pos += str_len
-        pos += 4  # hash
+        if decode_names:
+            names.append(decode_fstring(data[pos:pos + byte_len], width))
+        pos += byte_len + 4  # characters + hash
 
-    name_table_end = pos
+    return name_count, name_offset, pos, names
 
-    # Add new names
-    new_indices = {}
-    new_data = bytearray()
 
-    for name in names_to_add:
-        name_bytes = name.encode('utf-8') + b'\x00'
+def patch_uasset_names(uasset_data, names_to_add):
+    """
+    Add new names to a uasset file's name table.
+    Returns the modified data and a mapping of new name indices.
+    """
+    # Only the table end is needed here, so the names are skipped, not decoded
+    name_count, name_offset, name_table_end, _ = scan_name_table(uasset_data)
 
-        # Simple hash
-        hash_val = 0
-        for c in name.lower():
-            hash_val = ((hash_val ^ ord(c)) * 0x01000193) & 0xFFFFFFFF
+    data = bytearray(uasset_data)
 
-        new_data.extend(struct.pack('<I', len(name_bytes)))
-        new_data.extend(name_bytes)
-        new_data.extend(struct.pack('<I', hash_val))
+    # Add new names, sizing the block up front so it is written in place
+    new_indices = {}
+    encoded = [name.encode('utf-8') + b'\x00' for name in names_to_add]
+    new_data = bytearray(sum(4 + len(name_bytes) + 4 for name_bytes in encoded))
+    off = 0
+
+    for name, name_bytes in zip(names_to_add, encoded):
+        hash_val = name_hash(name)
+        _U32.pack_into(new_data, off, len(name_bytes))
+        off += 4
+        new_data[off:off + len(name_bytes)] = name_bytes
+        off += len(name_bytes)
+        _U32.pack_into(new_data, off, hash_val)
+        off += 4
 
         new_indices[name] = name_count
         name_count += 1
@@ -109,7 +147,7 @@ def patch_uasset_names(uasset_data, names_to_add):
     data[name_table_end:name_table_end] = new_data
 
     # Update the name count in header
-    data[41:45] = struct.pack('<i', name_count)
+    _I32.pack_into(data, 41, name_count)
 
     # Update all offsets after the name table
     offset_to_update = [
@@ -123,9 +161,9 @@ def patch_uasset_names(uasset_data, names_to_add):
     shift = len(new_data)
     for offset, size in offset_to_update:
         if offset + size <= len(data):
-            old_val = struct.unpack('<i', data[offset:offset + size])[0]
+            old_val = _I32.unpack_from(data, offset)[0]
             if old_val > name_table_end:
-                data[offset:offset + size] = struct.pack('<i', old_val + shift)
+                _I32.pack_into(data, offset, old_val + shift)
 
     return bytes(data), new_indices
 
@@ -144,47 +182,56 @@ def create_sorting_mod_v2():
 
     print("\n[1] Copying storage transfer slot (has sorting logic)...")
 
-    src_dir = BMSEXPORT_PATH / "UI" / "Merchant" / "selection" / "inventoryslot"
-    dst_dir = DUNGEONS_PATH / "UI" / "Merchant" / "selection" / "inventoryslot"
-    dst_dir.mkdir(parents=True, exist_ok=True)
+    src_dir = str(BMSEXPORT_PATH / "UI" / "Merchant" / "selection" / "inventoryslot")
+    dst_dir = str(DUNGEONS_PATH / "UI" / "Merchant" / "selection" / "inventoryslot")
+    present = list_dir(src_dir)
 
+    jobs = []
     for filename in ["UMG_SelectInventorySlot", "UMG_SelectStorageTransferSlot"]:
         for ext in [".uasset", ".uexp"]:
-            src = src_dir / f"{filename}{ext}"
-            dst = dst_dir / f"{filename}{ext}"
-            if src.exists():
-                shutil.copy2(src, dst)
-                print(f"  ✓ Copied {filename}{ext}")
+            name = f"{filename}{ext}"
+            if os.path.normcase(name) in present:
+                jobs.append((os.path.join(src_dir, name), os.path.join(dst_dir, name)))
+
+    copy_files(jobs)
+    for src, _ in jobs:
+        print(f"  ✓ Copied {os.path.basename(src)}")
 
     print("\n[2] Copying sort picker widgets...")
 
-    src_dir = BMSEXPORT_PATH / "Content_Season3" / "UI" / "StorageChest"
-    dst_dir = DUNGEONS_PATH / "Content_Season3" / "UI" / "StorageChest"
-    dst_dir.mkdir(parents=True, exist_ok=True)
+    src_dir = str(BMSEXPORT_PATH / "Content_Season3" / "UI" / "StorageChest")
+    dst_dir = str(DUNGEONS_PATH / "Content_Season3" / "UI" / "StorageChest")
+    present = list_dir(src_dir)
 
+    jobs = []
     for filename in ["UMG_SortSelectionPicker", "UMG_SortPickerItem",
                      "UMG_ExpandingListBase", "UMG_ExpandingListItem"]:
         for ext in [".uasset", ".uexp"]:
-            src = src_dir / f"{filename}{ext}"
-            dst = dst_dir / f"{filename}{ext}"
-            if src.exists():
-                shutil.copy2(src, dst)
-                print(f"  ✓ Copied {filename}{ext}")
+            name = f"{filename}{ext}"
+            if os.path.normcase(name) in present:
+                jobs.append((os.path.join(src_dir, name), os.path.join(dst_dir, name)))
+
+    copy_files(jobs)
+    for src, _ in jobs:
+        print(f"  ✓ Copied {os.path.basename(src)}")
 
     print("\n[3] Copying StorageChestMerchantContent (has sorting implementation)...")
 
-    src_dir = BMSEXPORT_PATH / "Content_Season2" / "UI" / "Merchant"
-    dst_dir = DUNGEONS_PATH / "Content_Season2" / "UI" / "Merchant"
-    dst_dir.mkdir(parents=True, exist_ok=True)
+    src_dir = str(BMSEXPORT_PATH / "Content_Season2" / "UI" / "Merchant")
+    dst_dir = str(DUNGEONS_PATH / "Content_Season2" / "UI" / "Merchant")
+    present = list_dir(src_dir)
 
+    jobs = []
     for filename in ["UMG_StorageChestMerchantContent", "UMG_StorageChestMerchantWidget",
                      "UMG_FilterSelection"]:
         for ext in [".uasset", ".uexp"]:
-            src = src_dir / f"{filename}{ext}"
-            dst = dst_dir / f"{filename}{ext}"
-            if src.exists():
-                shutil.copy2(src, dst)
-                print(f"  ✓ Copied {filename}{ext}")
+            name = f"{filename}{ext}"
+            if os.path.normcase(name) in present:
+                jobs.append((os.path.join(src_dir, name), os.path.join(dst_dir, name)))
+
+    copy_files(jobs)
+    for src, _ in jobs:
+        print(f"  ✓ Copied {os.path.basename(src)}")
 
     print("\n[4] Attempting to patch InventoryHUD to use sorting components...")
 
@@ -192,80 +239,78 @@ def create_sorting_mod_v2():
     inv_uasset = BMSEXPORT_PATH / "UI" / "Inventory" / "UMG_InventoryHUD.uasset"
     inv_uexp = BMSEXPORT_PATH / "UI" / "Inventory" / "UMG_InventoryHUD.uexp"
 
-    with open(inv_uasset, 'rb') as f:
-        uasset_data = f.read()
-    with open(inv_uexp, 'rb') as f:
-        uexp_data = f.read()
-
-    # Read the storage chest to understand the sorting structure
-    storage_uasset = BMSEXPORT_PATH / "Content_Season2" / "UI" / "Merchant" / "UMG_StorageChestMerchantContent.uasset"
-    storage_uexp = BMSEXPORT_PATH / "Content_Season2" / "UI" / "Merchant" / "UMG_StorageChestMerchantContent.uexp"
-
-    with open(storage_uasset, 'rb') as f:
-        storage_uasset_data = f.read()
-    with open(storage_uexp, 'rb') as f:
-        storage_uexp_data = f.read()
-
-    # Add sorting-related names to the inventory HUD
-    names_to_add = [
-        "/Game/Content_Season3/UI/StorageChest/UMG_SortSelectionPicker",
-        "UMG_SortSelectionPicker_C",
-        "InventorySort",
-        "onOptionSelected",
-        "OnSortOptionSelected",
-        "SortItems",
-        "sortBy",
-        "EItemSortMethod",
-        "GetSelectedSort",
-        "sortMethod",
-        "ApplyFiltersAndSorting",
-        "SetInventoryFilterSort",
-        "CurrentSortMethod",
-        "BndEvt__InventorySort_K2Node_ComponentBoundEvent_onOptionSelected__DelegateSignature",
-    ]
-
-    patched_uasset, name_indices = patch_uasset_names(uasset_data, names_to_add)
-
-    print(f"  Added {len(names_to_add)} new names to InventoryHUD")
-    for name, idx in name_indices.items():
-        print(f"    [{idx}] {name[:50]}...")
-
-    # Save the patched files
-    out_dir = DUNGEONS_PATH / "UI" / "Inventory"
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    with open(out_dir / "UMG_InventoryHUD.uasset", 'wb') as f:
-        f.write(patched_uasset)
-    with open(out_dir / "UMG_InventoryHUD.uexp", 'wb') as f:
-        f.write(uexp_data)
+    # The sources are mapped read-only; patch_uasset_names makes its own
+    # mutable copy, so only the patched uasset is ever held in memory
+    with ExitStack() as stack:
+        uasset_data = stack.enter_context(map_file(inv_uasset))
+        uexp_data = stack.enter_context(map_file(inv_uexp))
+
+        # Add sorting-related names to the inventory HUD
+        names_to_add = [
+            "/Game/Content_Season3/UI/StorageChest/UMG_SortSelectionPicker",
+            "UMG_SortSelectionPicker_C",
+            "InventorySort",
+            "onOptionSelected",
+            "OnSortOptionSelected",
+            "SortItems",
+            "sortBy",
+            "EItemSortMethod",
+            "GetSelectedSort",
+            "sortMethod",
+            "ApplyFiltersAndSorting",
+            "SetInventoryFilterSort",
+            "CurrentSortMethod",
+            "BndEvt__InventorySort_K2Node_ComponentBoundEvent_onOptionSelected__DelegateSignature",
+        ]
+
+        patched_uasset, name_indices = patch_uasset_names(uasset_data, names_to_add)
+
+        print(f"  Added {len(names_to_add)} new names to InventoryHUD")
+        for name, idx in name_indices.items():
+            print(f"    [{idx}] {name[:50]}...")
+
+        # Save the patched files
+        out_dir = DUNGEONS_PATH / "UI" / "Inventory"
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        with open(out_dir / "UMG_InventoryHUD.uasset", 'wb') as f:
+            f.write(patched_uasset)
+        with open(out_dir / "UMG_InventoryHUD.uexp", 'wb') as f:
+            f.write(uexp_data)
 
     print(f"\n  ✓ Saved patched InventoryHUD to {out_dir}")
 
     # Also copy merchant utilities
     print("\n[5] Copying additional utilities...")
 
-    bpl_src = BMSEXPORT_PATH / "UI" / "Merchant"
-    bpl_dst = DUNGEONS_PATH / "UI" / "Merchant"
-    bpl_dst.mkdir(parents=True, exist_ok=True)
+    bpl_src = str(BMSEXPORT_PATH / "UI" / "Merchant")
+    bpl_dst = str(DUNGEONS_PATH / "UI" / "Merchant")
+    present = list_dir(bpl_src)
 
+    jobs = []
     for ext in [".uasset", ".uexp"]:
-        src = bpl_src / f"BPL_Merchants{ext}"
-        dst = bpl_dst / f"BPL_Merchants{ext}"
-        if src.exists():
-            shutil.copy2(src, dst)
-            print(f"  ✓ Copied BPL_Merchants{ext}")
+        name = f"BPL_Merchants{ext}"
+        if os.path.normcase(name) in present:
+            jobs.append((os.path.join(bpl_src, name), os.path.join(bpl_dst, name)))
+
+    copy_files(jobs)
+    for src, _ in jobs:
+        print(f"  ✓ Copied {os.path.basename(src)}")
 
     # Copy sound effect
-    sfx_src = BMSEXPORT_PATH / "AudioForce" / "04_playback_soundCue" / "03_sfx_ui"
-    sfx_dst = DUNGEONS_PATH / "AudioForce" / "04_playback_soundCue" / "03_sfx_ui"
-    sfx_dst.mkdir(parents=True, exist_ok=True)
+    sfx_src = str(BMSEXPORT_PATH / "AudioForce" / "04_playback_soundCue" / "03_sfx_ui")
+    sfx_dst = str(DUNGEONS_PATH / "AudioForce" / "04_playback_soundCue" / "03_sfx_ui")
+    present = list_dir(sfx_src)
 
+    jobs = []
     for ext in [".uasset", ".uexp"]:
-        src = sfx_src / f"sfx_ui_diabloSort{ext}"
-        dst = sfx_dst / f"sfx_ui_diabloSort{ext}"
-        if src.exists():
-            shutil.copy2(src, dst)
-            print(f"  ✓ Copied sfx_ui_diabloSort{ext}")
+        name = f"sfx_ui_diabloSort{ext}"
+        if os.path.normcase(name) in present:
+            jobs.append((os.path.join(sfx_src, name), os.path.join(sfx_dst, name)))
+
+    copy_files(jobs)
+    for src, _ in jobs:
+        print(f"  ✓ Copied {os.path.basename(src)}")
 
     print("\n" + "=" * 60)
     print("PATCH COMPLETE")
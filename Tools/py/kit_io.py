@@ -0,0 +1,103 @@
+"""
+Minecraft Dungeons - Mod Kit file helpers
+File mapping, FString decoding and fast file copying shared by the
+inventory sort scripts.
+"""
+
+import os
+import sys
+import mmap
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Number of files copied at once
+COPY_WORKERS = 8
+
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+    _CopyFileExW = ctypes.windll.kernel32.CopyFileExW
+    _CopyFileExW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_void_p,
+                             ctypes.c_void_p, ctypes.c_void_p, wintypes.DWORD]
+    _CopyFileExW.restype = wintypes.BOOL
+else:
+    _CopyFileExW = None
+
+
+@contextmanager
+def map_file(filepath):
+    """Memory-map a file read-only for the duration of the with block"""
+    with open(filepath, 'rb') as f:
+        # mmap refuses zero-length files
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def decode_fstring(raw: bytes, width: int) -> str:
+    """Decode FString characters of the given width, dropping the null terminator"""
+    if width == 1:
+        # Nearly every name is plain ASCII: cut at the terminator on the raw
+        # bytes (a memchr) and try the cheap strict ASCII decode before UTF-8.
+        # UTF-16 can't be cut this way since its characters contain zero bytes
+        raw = raw.partition(b'\x00')[0]
+        try:
+            return raw.decode('ascii')
+        except UnicodeDecodeError:
+            return raw.decode('utf-8', errors='ignore')
+    return raw.decode('utf-16-le', errors='ignore').rstrip('\x00')
+
+
+def fast_copy(src, dst):
+    """
+    Copy a file and its metadata like shutil.copy2, but let the OS do
+    the data transfer: CopyFileExW on Windows, copy_file_range on Linux
+    (an in-kernel copy, or a reflink on btrfs/xfs).
+    """
+    if _CopyFileExW is not None:
+        if _CopyFileExW(str(src), str(dst), None, None, None, 0):
+            return
+    elif hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as s, open(dst, 'wb') as d:
+                remaining = os.fstat(s.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(s.fileno(), d.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+
+    shutil.copy2(src, dst)
+
+
+def list_dir(path):
+    """
+    Names of the entries in a directory, empty if it doesn't exist.
+    Names are normcase'd so lookups stay case-insensitive on Windows.
+    """
+    try:
+        with os.scandir(path) as it:
+            return {os.path.normcase(entry.name) for entry in it}
+    except FileNotFoundError:
+        return set()
+
+
+def copy_files(jobs):
+    """Copy (src, dst) pairs concurrently, creating the destination folders first"""
+    # Make the folders up front so the workers never race on mkdir
+    for dst_dir in {os.path.dirname(dst) for _, dst in jobs}:
+        os.makedirs(dst_dir, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+        list(pool.map(lambda job: fast_copy(*job), jobs))
@@ -7,11 +7,16 @@ widget that's already used in the Storage Chest UI.
 """
 
 import os
+import re
 import sys
-import shutil
+import functools
 import struct
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
 
+from kit_io import map_file, list_dir, copy_files
+
 # Paths relative to the mod kit root
 SCRIPT_DIR = Path(__file__).parent
 MOD_KIT_ROOT = SCRIPT_DIR.parent.parent
@@ -25,25 +30,126 @@ SORT_PICKER_PATH = BMSEXPORT_PATH / "Content_Season3" / "UI" / "StorageChest" /
 STORAGE_CONTENT_PATH = BMSEXPORT_PATH / "Content_Season2" / "UI" / "Merchant" / "UMG_StorageChestMerchantContent"
 SELECT_STORAGE_PATH = BMSEXPORT_PATH / "UI" / "Merchant" / "selection" / "inventoryslot" / "UMG_SelectStorageTransferSlot"
 
+# Precompiled header/table readers
+_U32 = struct.Struct('<I')
+_I32 = struct.Struct('<i')
+# ClassPackage, ClassName, OuterIndex, ObjectName and the 4 bytes left of a 28-byte import
+_IMPORT = struct.Struct('<qqii4x')
+
+# Written to Tools/INVENTORY_SORT_INSTRUCTIONS.txt when the patch falls back to manual steps
+_INSTRUCTIONS = """
+================================================================================
+INVENTORY SORTING MOD - MANUAL COMPLETION STEPS
+================================================================================
+
+The automated tool has copied all necessary supporting files. To complete the
+modification, you need to edit UMG_InventoryHUD.uasset using UAssetGUI.
+
+DOWNLOAD UASSETGUI:
+  https://github.com/atenfyr/UAssetGUI/releases
+
+STEPS TO ADD SORTING:
+
+1. Open UAssetGUI and load:
+   Precooked/Content/UI/Inventory/UMG_InventoryHUD.uasset
+
+2. In the Name Map, add these new names:
+   - UMG_SortSelectionPicker
+   - UMG_SortSelectionPicker_C
+   - /Game/Content_Season3/UI/StorageChest/UMG_SortSelectionPicker
+   - InventorySort
+   - onOptionSelected
+   - SortItems
+   - sortBy
+   - EItemSortMethod
+
+3. In the Import Table, add an import for:
+   - ClassPackage: /Game/Content_Season3/UI/StorageChest/UMG_SortSelectionPicker
+   - ClassName: WidgetBlueprintGeneratedClass
+   - ObjectName: UMG_SortSelectionPicker_C
+
+4. In the Export Table, find the main widget hierarchy and add a child widget
+   of type UMG_SortSelectionPicker_C named "InventorySort"
+
+5. Save the modified file
+
+6. Run cook_assets.bat or package.bat to test
 
-def read_uasset(path):
-    """Read a .uasset file and return its contents"""
+ALTERNATIVE (EASIER):
+If UAssetGUI modification is too complex, you can:
+
+1. Open the UE4 project in Unreal Editor 4.22
+2. Create a new Widget Blueprint based on UMG_InventoryHUD
+3. Add the UMG_SortSelectionPicker widget to the UI
+4. Connect the onOptionSelected event to call SortItems on your inventory
+5. Cook and package
+
+================================================================================
+"""
+
+
+def read_uasset(path, stack):
+    """
+    Map a .uasset (kept open until stack closes) and return it with the size
+    of its .uexp, or None if there is none. Nothing here parses export data,
+    so the .uexp itself is never opened.
+    Returns (None, None) if the .uasset is missing - callers report it.
+    """
     uasset_path = Path(str(path) + ".uasset")
     uexp_path = Path(str(path) + ".uexp")
 
     if not uasset_path.exists():
-        print(f"Error: {uasset_path} not found")
         return None, None
 
-    with open(uasset_path, 'rb') as f:
-        uasset_data = f.read()
+    uasset_data = stack.enter_context(map_file(uasset_path))
+
+    try:
+        uexp_size = os.path.getsize(uexp_path)
+    except FileNotFoundError:
+        uexp_size = None
+
+    return uasset_data, uexp_size
 
-    uexp_data = None
-    if uexp_path.exists():
-        with open(uexp_path, 'rb') as f:
-            uexp_data = f.read()
 
-    return uasset_data, uexp_data
+def _parse_ascii_names(data, name_offset, count):
+    """
+    Fast path for the usual all-ASCII name table: no UTF-16 handling, names
+    are sliced straight out of the buffer and decoded in one go. Returns None
+    on anything else (a UTF-16 entry, non-ASCII bytes, an embedded null) so
+    the caller can take the general walk.
+    """
+    parts = [None] * count
+    data_len = len(data)
+    unpack_i32 = _I32.unpack_from
+    pos = name_offset
+
+    for i in range(count):
+        if pos >= data_len - 4:
+            break
+
+        str_len = unpack_i32(data, pos)[0]
+        if str_len < 0:
+            return None
+        if str_len > 1000 or str_len == 0:  # Sanity check
+            break
+
+        pos += 4
+        end = pos + str_len
+        if end > data_len:
+            break
+
+        parts[i] = data[pos:end - 1]
+        # Skip the null terminator and hash (4 bytes)
+        pos = end + 4
+    else:
+        i = count
+    del parts[i:]
+
+    joined = b'\x00'.join(parts)
+    if not joined.isascii():
+        return None
+    names = joined.decode('ascii').split('\x00')
+    return names if len(names) == len(parts) else None
 
 
 def find_name_table(data):
@@ -56,7 +162,7 @@ def find_name_table(data):
         return []
 
     # Check magic
-    magic = struct.unpack('<I', data[0:4])[0]
+    magic = _U32.unpack_from(data, 0)[0]
     if magic != 0x9E2A83C1:
         print(f"Warning: Unexpected magic number: {hex(magic)}")
         return []
@@ -64,99 +170,157 @@ def find_name_table(data):
     # Parse header to find name table offset and count
     # Offset 41: NameCount (4 bytes)
     # Offset 45: NameOffset (4 bytes)
-    try:
-        name_count = struct.unpack('<I', data[41:45])[0]
-        name_offset = struct.unpack('<I', data[45:49])[0]
-    except:
-        return []
+    name_count = _U32.unpack_from(data, 41)[0]
+    name_offset = _U32.unpack_from(data, 45)[0]
 
-    names = []
-    pos = name_offset
+    limit = min(name_count, 1000)  # Limit to prevent infinite loops
 
-    for i in range(min(name_count, 1000)):  # Limit to prevent infinite loops
-        if pos >= len(data) - 4:
-            break
-
-        # Read string length (includes null terminator)
-        str_len = struct.unpack('<I', data[pos:pos + 4])[0]
-        pos += 4
+    # Most tables are plain ASCII, try the specialised walk first
+    names = _parse_ascii_names(data, name_offset, limit)
+    if names is not None:
+        return names
 
-        if str_len > 1000 or str_len == 0:  # Sanity check
-            break
+    spans = [None] * limit
+    wide = {}
+    data_len = len(data)
+    unpack_i32 = _I32.unpack_from
+    pos = name_offset
 
-        # Handle negative length (UTF-16)
-        if str_len & 0x80000000:
-            str_len = -(str_len - 0x100000000) * 2
+    with memoryview(data) as mv:
+        for count in range(limit):
+            if pos >= data_len - 4:
+                break
+
+            # Read string length (includes null terminator); a negative
+            # length counts UTF-16 characters instead of bytes
+            str_len = unpack_i32(mv, pos)[0]
+            pos += 4
+
+            if str_len > 1000 or str_len < -1000 or str_len == 0:  # Sanity check
+                break
+
+            is_utf16 = str_len < 0
+            byte_len = -2 * str_len if is_utf16 else str_len
+
+            if pos + byte_len > data_len:
+                break
+
+            if is_utf16:
+                wide[count] = str(mv[pos:pos + byte_len - 2], 'utf-16-le', 'ignore')
+                # Empty placeholder keeps the batch decode below aligned
+                spans[count] = (pos, pos)
+            else:
+                spans[count] = (pos, pos + byte_len - 1)
+            pos += byte_len
+
+            # Skip hash (4 bytes)
+            pos += 4
+        else:
+            count = limit
+        del spans[count:]
+
+        # Decode the whole table at once: join the names on their terminator,
+        # decode and split. 'ignore' never eats a null byte, so the split only
+        # goes wrong if a name itself contains one.
+        names = str(b'\x00'.join([mv[a:b] for a, b in spans]), 'utf-8', 'ignore').split('\x00')
+        if len(names) != len(spans):
+            names = [str(mv[a:b], 'utf-8', 'ignore') for a, b in spans]
+        for i, name in wide.items():
+            names[i] = name
 
-        if pos + str_len > len(data):
-            break
+    return names
 
-        try:
-            name = data[pos:pos + str_len - 1].decode('utf-8', errors='ignore')
-            names.append(name)
-        except:
-            names.append("")
 
-        pos += str_len
+def _names_containing(names, joined, token):
+    """Indices of the names containing token, found by scanning the joined names"""
+    if joined is None:
+        return [i for i, n in enumerate(names) if token in n]
+
+    hits = []
+    index = 0
+    name_end = 0
+    pos = joined.find(token)
+    while pos != -1:
+        index += joined.count('\x00', name_end, pos)
+        hits.append(index)
+        # One hit per name is enough, resume at the next one
+        name_end = joined.find('\x00', pos)
+        if name_end == -1:
+            break
+        pos = joined.find(token, name_end)
+    return hits
 
-        # Skip hash (4 bytes)
-        pos += 4
 
-    return names
+def index_names(names):
+    """
+    Bucket (index, name) pairs by the substrings the reports look for.
+    The names are joined into one string so each token is a handful of
+    C-level str.find calls instead of a Python 'in' test per name.
+    """
+    # The separator can't be part of a token, so a hit never spans two names
+    joined = '\x00'.join(names)
+    # A name with an embedded null would throw the separator count off
+    if joined.count('\x00') != len(names) - 1:
+        joined = None
+    sort_idx = _names_containing(names, joined, 'Sort')
+    filter_idx = _names_containing(names, joined, 'Filter')
+    # 'sort' holds names matching either capitalisation
+    any_sort_idx = sorted(set(sort_idx).union(_names_containing(names, joined, 'sort')))
+
+    return {
+        'Sort': [(i, names[i]) for i in sort_idx],
+        'sort': [(i, names[i]) for i in any_sort_idx],
+        'SortSelectionPicker': [(i, names[i]) for i in sort_idx if 'SortSelectionPicker' in names[i]],
+        'Filter': [(i, names[i]) for i in filter_idx],
+        'FilterButton': [(i, names[i]) for i in filter_idx
+                         if 'FilterButton' in names[i] or 'FiltersRow' in names[i]],
+    }
 
 
 def analyze_imports(data, names):
     """Analyze import table to find widget references"""
     # Import table comes after names
     # Look for import count and offset in header
-    try:
-        import_count = struct.unpack('<I', data[57:61])[0]
-        import_offset = struct.unpack('<I', data[61:65])[0]
-    except:
+    if len(data) < 65:
         return []
-
-    imports = []
-    # Each import is 28 bytes in UE4
-    pos = import_offset
-    for i in range(min(import_count, 500)):
-        if pos + 28 > len(data):
-            break
-        try:
-            class_package = struct.unpack('<q', data[pos:pos + 8])[0]
-            class_name = struct.unpack('<q', data[pos + 8:pos + 16])[0]
-            outer_index = struct.unpack('<i', data[pos + 16:pos + 20])[0]
-            object_name = struct.unpack('<i', data[pos + 20:pos + 24])[0]
-
+    import_count = _U32.unpack_from(data, 57)[0]
+    import_offset = _U32.unpack_from(data, 61)[0]
+
+    # Each import is 28 bytes in UE4; only whole records inside the file are read
+    table_len = min(import_count, 500, max(0, (len(data) - import_offset) // _IMPORT.size))
+    imports = [None] * table_len
+    name_count = len(names)
+    # Decode the whole table in one C-level pass
+    with memoryview(data)[import_offset:import_offset + table_len * _IMPORT.size] as table:
+        for i, (class_package, class_name, outer_index, object_name) in enumerate(_IMPORT.iter_unpack(table)):
             # Convert indices to names
-            pkg_name = names[class_package] if 0 <= class_package < len(names) else f"idx_{class_package}"
-            cls_name = names[class_name] if 0 <= class_name < len(names) else f"idx_{class_name}"
-            obj_name = names[object_name] if 0 <= object_name < len(names) else f"idx_{object_name}"
+            pkg_name = names[class_package] if 0 <= class_package < name_count else f"idx_{class_package}"
+            cls_name = names[class_name] if 0 <= class_name < name_count else f"idx_{class_name}"
+            obj_name = names[object_name] if 0 <= object_name < name_count else f"idx_{object_name}"
 
-            imports.append({
+            imports[i] = {
                 'class_package': pkg_name,
                 'class_name': cls_name,
                 'object_name': obj_name,
                 'outer_index': outer_index
-            })
-        except:
-            pass
-        pos += 28
+            }
 
     return imports
 
 
+@functools.lru_cache(maxsize=None)
+def _compile(search_bytes):
+    pattern = re.escape(search_bytes)
+    # finditer resumes after each match, so a needle that can overlap itself
+    # (b'aa' in b'aaa') needs a lookahead to keep reporting every hit
+    if any(search_bytes[:k] == search_bytes[-k:] for k in range(1, len(search_bytes))):
+        pattern = b'(?=' + pattern + b')'
+    return re.compile(pattern)
+
+
 def find_string_in_binary(data, search_string):
     """Find all occurrences of a string in binary data"""
-    search_bytes = search_string.encode('utf-8')
-    positions = []
-    pos = 0
-    while True:
-        pos = data.find(search_bytes, pos)
-        if pos == -1:
-            break
-        positions.append(pos)
-        pos += 1
-    return positions
+    return [m.start() for m in _compile(search_string.encode('utf-8')).finditer(data)]
 
 
 def patch_add_sort_reference(uasset_data, uexp_data):
@@ -175,6 +339,12 @@ def patch_add_sort_reference(uasset_data, uexp_data):
     return None, None
 
 
+def _report_copied(jobs):
+    """List a batch of copied files, relative to the kit root, in one write"""
+    if jobs:
+        print("\n".join(f"  Copied: {dst.relative_to(MOD_KIT_ROOT)}" for _, dst in jobs))
+
+
 def copy_sort_widget_files():
     """Copy the sorting widget files to the mod output"""
     # The sort picker and its dependencies need to be included
@@ -185,65 +355,102 @@ def copy_sort_widget_files():
         ("Content_Season3/UI/StorageChest/UMG_ExpandingListItem", "Content_Season3/UI/StorageChest/UMG_ExpandingListItem"),
     ]
 
-    copied = []
+    # One directory listing per source folder instead of a stat per file
+    listings = {}
+    jobs = []
     for src_rel, dst_rel in files_to_copy:
+        src_dir, src_name = os.path.split(src_rel)
+        if src_dir not in listings:
+            listings[src_dir] = list_dir(BMSEXPORT_PATH / src_dir)
+        present = listings[src_dir]
+
         for ext in ['.uasset', '.uexp']:
-            src = BMSEXPORT_PATH / (src_rel + ext)
-            dst = OUTPUT_PATH / (dst_rel + ext)
+            if os.path.normcase(src_name + ext) in present:
+                jobs.append((BMSEXPORT_PATH / (src_rel + ext), OUTPUT_PATH / (dst_rel + ext)))
+
+    copy_files(jobs)
+    _report_copied(jobs)
+    return [str(dst) for _, dst in jobs]
+
 
-            if src.exists():
-                dst.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, dst)
-                copied.append(str(dst))
-                print(f"  Copied: {dst.relative_to(MOD_KIT_ROOT)}")
+@functools.lru_cache(maxsize=32)
+def _load_and_index_cached(path, mtime_ns):
+    with ExitStack() as stack:
+        uasset_data, uexp_size = read_uasset(path, stack)
+        names = find_name_table(uasset_data) if uasset_data else []
+        # Only the size outlives the map
+        uasset_size = None if uasset_data is None else len(uasset_data)
+    return uasset_size, uexp_size, names, index_names(names)
 
-    return copied
+
+def _load_and_index(path):
+    """
+    Parse an asset's name table and bucket its names (runs on the analysis pool).
+    Returns (uasset size, uexp size, names, name buckets), with a None uasset
+    size if it is missing. Cached on the .uasset's mtime, so asking for the
+    same unchanged asset again within a run costs a stat.
+    """
+    try:
+        mtime_ns = os.stat(str(path) + ".uasset").st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None
+    return _load_and_index_cached(str(path), mtime_ns)
 
 
 def analyze_and_report():
-    """Analyze the files and report findings"""
+    """
+    Analyze the files and report findings.
+    Returns (uasset size, uexp size, names, name buckets) for UMG_InventoryHUD.
+    """
     print("\n" + "=" * 60)
     print("MINECRAFT DUNGEONS - INVENTORY SORT ANALYSIS")
     print("=" * 60)
 
+    # The three assets are independent, so fault them in and parse them
+    # concurrently, then report in order
+    paths = (INVENTORY_HUD_PATH, SORT_PICKER_PATH, SELECT_STORAGE_PATH)
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        inv, sort, storage = pool.map(_load_and_index, paths)
+
     # Analyze UMG_InventoryHUD
     print("\n[1] Analyzing UMG_InventoryHUD...")
-    inv_uasset, inv_uexp = read_uasset(INVENTORY_HUD_PATH)
-    if inv_uasset:
-        names = find_name_table(inv_uasset)
-        print(f"    File size: {len(inv_uasset):,} bytes (uasset) + {len(inv_uexp) if inv_uexp else 0:,} bytes (uexp)")
+    inv_uasset, inv_uexp, names, buckets = inv
+    if inv_uasset is None:
+        print(f"Error: {INVENTORY_HUD_PATH}.uasset not found")
+    elif inv_uasset:
+        print(f"    File size: {inv_uasset:,} bytes (uasset) + {inv_uexp or 0:,} bytes (uexp)")
         print(f"    Name table entries: {len(names)}")
 
         # Check for sorting references
-        has_sort = any('Sort' in n for n in names)
-        has_filter = any('Filter' in n for n in names)
-        print(f"    Has sorting: {has_sort}")
-        print(f"    Has filtering: {has_filter}")
+        print(f"    Has sorting: {bool(buckets['Sort'])}")
+        print(f"    Has filtering: {bool(buckets['Filter'])}")
 
         # Find filter-related names
-        filter_names = [n for n in names if 'Filter' in n][:10]
+        filter_names = [n for _, n in buckets['Filter'][:5]]
         if filter_names:
-            print(f"    Filter functions: {filter_names[:5]}")
+            print(f"    Filter functions: {filter_names}")
 
     # Analyze UMG_SortSelectionPicker
     print("\n[2] Analyzing UMG_SortSelectionPicker...")
-    sort_uasset, sort_uexp = read_uasset(SORT_PICKER_PATH)
-    if sort_uasset:
-        names = find_name_table(sort_uasset)
-        print(f"    File size: {len(sort_uasset):,} bytes (uasset) + {len(sort_uexp) if sort_uexp else 0:,} bytes (uexp)")
-        sort_names = [n for n in names if 'Sort' in n or 'sort' in n]
-        print(f"    Sort-related names: {sort_names[:10]}")
+    sort_uasset, sort_uexp, _, buckets = sort
+    if sort_uasset is None:
+        print(f"Error: {SORT_PICKER_PATH}.uasset not found")
+    elif sort_uasset:
+        print(f"    File size: {sort_uasset:,} bytes (uasset) + {sort_uexp or 0:,} bytes (uexp)")
+        sort_names = [n for _, n in buckets['sort'][:10]]
+        print(f"    Sort-related names: {sort_names}")
 
     # Analyze UMG_SelectStorageTransferSlot (has the actual sorting logic)
     print("\n[3] Analyzing UMG_SelectStorageTransferSlot...")
-    storage_uasset, storage_uexp = read_uasset(SELECT_STORAGE_PATH)
-    if storage_uasset:
-        names = find_name_table(storage_uasset)
-        print(f"    File size: {len(storage_uasset):,} bytes (uasset) + {len(storage_uexp) if storage_uexp else 0:,} bytes (uexp)")
-        sort_funcs = [n for n in names if 'Sort' in n]
+    storage_uasset, storage_uexp, _, buckets = storage
+    if storage_uasset is None:
+        print(f"Error: {SELECT_STORAGE_PATH}.uasset not found")
+    elif storage_uasset:
+        print(f"    File size: {storage_uasset:,} bytes (uasset) + {storage_uexp or 0:,} bytes (uexp)")
+        sort_funcs = [n for _, n in buckets['Sort']]
         print(f"    Sorting functions: {sort_funcs}")
 
-    return inv_uasset, inv_uexp
+    return inv
 
 
 def create_modified_inventory_hud():
@@ -266,12 +473,14 @@ def create_modified_inventory_hud():
     # Copy the original InventoryHUD files to precooked
     print("\n[Step 1] Copying base files to Precooked folder...")
 
+    present = list_dir(INVENTORY_HUD_PATH.parent)
+    jobs = []
     for ext in ['.uasset', '.uexp']:
-        src = Path(str(INVENTORY_HUD_PATH) + ext)
-        if src.exists():
-            dst = precooked_ui_path / f"UMG_InventoryHUD{ext}"
-            shutil.copy2(src, dst)
-            print(f"  Copied: {dst.relative_to(MOD_KIT_ROOT)}")
+        if os.path.normcase(f"UMG_InventoryHUD{ext}") in present:
+            jobs.append((Path(str(INVENTORY_HUD_PATH) + ext), precooked_ui_path / f"UMG_InventoryHUD{ext}"))
+
+    copy_files(jobs)
+    _report_copied(jobs)
 
     # Copy sort picker dependencies
     print("\n[Step 2] Copying sort picker widgets...")
@@ -283,13 +492,15 @@ def create_modified_inventory_hud():
     select_storage_dst = OUTPUT_PATH / "UI" / "Merchant" / "selection" / "inventoryslot"
     select_storage_dst.mkdir(parents=True, exist_ok=True)
 
+    present = list_dir(select_storage_src)
+    jobs = []
     for filename in ['UMG_SelectInventorySlot', 'UMG_SelectStorageTransferSlot']:
         for ext in ['.uasset', '.uexp']:
-            src = select_storage_src / f"{filename}{ext}"
-            if src.exists():
-                dst = select_storage_dst / f"{filename}{ext}"
-                shutil.copy2(src, dst)
-                print(f"  Copied: {dst.relative_to(MOD_KIT_ROOT)}")
+            if os.path.normcase(f"{filename}{ext}") in present:
+                jobs.append((select_storage_src / f"{filename}{ext}", select_storage_dst / f"{filename}{ext}"))
+
+    copy_files(jobs)
+    _report_copied(jobs)
 
     # Copy BPL_Merchants which has GetSortText
     print("\n[Step 4] Copying merchant utilities...")
@@ -297,100 +508,50 @@ def create_modified_inventory_hud():
     bpl_dst = OUTPUT_PATH / "UI" / "Merchant"
     bpl_dst.mkdir(parents=True, exist_ok=True)
 
+    present = list_dir(bpl_src)
+    jobs = []
     for ext in ['.uasset', '.uexp']:
-        src = bpl_src / f"BPL_Merchants{ext}"
-        if src.exists():
-            dst = bpl_dst / f"BPL_Merchants{ext}"
-            shutil.copy2(src, dst)
-            print(f"  Copied: {dst.relative_to(MOD_KIT_ROOT)}")
+        if os.path.normcase(f"BPL_Merchants{ext}") in present:
+            jobs.append((bpl_src / f"BPL_Merchants{ext}", bpl_dst / f"BPL_Merchants{ext}"))
+
+    copy_files(jobs)
+    _report_copied(jobs)
 
     return True
 
 
 def create_uassetgui_instructions():
     """Create instructions for using UAssetGUI to complete the modification"""
-    instructions = """
-================================================================================
-INVENTORY SORTING MOD - MANUAL COMPLETION STEPS
-================================================================================
-
-The automated tool has copied all necessary supporting files. To complete the
-modification, you need to edit UMG_InventoryHUD.uasset using UAssetGUI.
-
-DOWNLOAD UASSETGUI:
-  https://github.com/atenfyr/UAssetGUI/releases
-
-STEPS TO ADD SORTING:
-
-1. Open UAssetGUI and load:
-   Precooked/Content/UI/Inventory/UMG_InventoryHUD.uasset
-
-2. In the Name Map, add these new names:
-   - UMG_SortSelectionPicker
-   - UMG_SortSelectionPicker_C
-   - /Game/Content_Season3/UI/StorageChest/UMG_SortSelectionPicker
-   - InventorySort
-   - onOptionSelected
-   - SortItems
-   - sortBy
-   - EItemSortMethod
-
-3. In the Import Table, add an import for:
-   - ClassPackage: /Game/Content_Season3/UI/StorageChest/UMG_SortSelectionPicker
-   - ClassName: WidgetBlueprintGeneratedClass
-   - ObjectName: UMG_SortSelectionPicker_C
-
-4. In the Export Table, find the main widget hierarchy and add a child widget
-   of type UMG_SortSelectionPicker_C named "InventorySort"
-
-5. Save the modified file
-
-6. Run cook_assets.bat or package.bat to test
-
-ALTERNATIVE (EASIER):
-If UAssetGUI modification is too complex, you can:
-
-1. Open the UE4 project in Unreal Editor 4.22
-2. Create a new Widget Blueprint based on UMG_InventoryHUD
-3. Add the UMG_SortSelectionPicker widget to the UI
-4. Connect the onOptionSelected event to call SortItems on your inventory
-5. Cook and package
-
-================================================================================
-"""
-
     instructions_path = MOD_KIT_ROOT / "Tools" / "INVENTORY_SORT_INSTRUCTIONS.txt"
-    with open(instructions_path, 'w') as f:
-        f.write(instructions)
+    instructions_path.write_text(_INSTRUCTIONS, encoding='utf-8')
     print(f"\n[INFO] Instructions saved to: {instructions_path.relative_to(MOD_KIT_ROOT)}")
     return instructions_path
 
 
-def attempt_binary_patch():
+def attempt_binary_patch(inv_uasset, inv_uexp, names, buckets):
     """
     Attempt to create a working patch by modifying the binary directly.
     This is experimental but might work for simple additions.
+
+    Takes UMG_InventoryHUD as already parsed by analyze_and_report.
     """
     print("\n" + "=" * 60)
     print("ATTEMPTING BINARY PATCH (EXPERIMENTAL)")
     print("=" * 60)
 
-    inv_uasset, inv_uexp = read_uasset(INVENTORY_HUD_PATH)
     if not inv_uasset or not inv_uexp:
         print("Error: Could not read inventory files")
         return False
 
-    # Parse the name table
-    names = find_name_table(inv_uasset)
     print(f"Found {len(names)} names in the asset")
 
     # Check if sorting already exists
-    if any('SortSelectionPicker' in n for n in names):
+    if buckets['SortSelectionPicker']:
         print("Sorting widget reference already exists!")
         return True
 
     # Find where the filter buttons are defined - we'll add sort nearby
-    filter_refs = [i for i, n in enumerate(names) if 'FilterButton' in n or 'FiltersRow' in n]
+    filter_refs = [i for i, _ in buckets['FilterButton']]
     print(f"Filter button name indices: {filter_refs}")
 
     # For now, let's just copy the files and note what needs to change
@@ -420,10 +581,12 @@ def main():
         return 1
 
     # Analyze the files
-    analyze_and_report()
+    inventory = analyze_and_report()
+
+    # Attempt the patch, reusing the InventoryHUD parse from the analysis
+    patched = attempt_binary_patch(*inventory)
 
-    # Attempt the patch
-    if not attempt_binary_patch():
+    if not patched:
         # Fallback: prepare files and provide instructions
         create_modified_inventory_hud()
         create_uassetgui_instructions()
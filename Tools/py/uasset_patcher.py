@@ -7,24 +7,200 @@ This tool uses knowledge of the UE4 uasset format to inject the necessary
 references and logic.
 """
 
+from __future__ import annotations
+
 import os
 import sys
+import mmap
 import struct
 import shutil
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
-import copy
 
 SCRIPT_DIR = Path(__file__).parent
 MOD_KIT_ROOT = SCRIPT_DIR.parent.parent
 BMSEXPORT_PATH = MOD_KIT_ROOT / "quickbms" / "BmsExport" / "Dungeons" / "Content"
 PRECOOKED_PATH = MOD_KIT_ROOT / "Precooked" / "Content"
 
+_I32 = struct.Struct('<i')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_IMPORT = struct.Struct('<qqii4x')
+_EXPORT = struct.Struct('<iiiiiIqq64x')
+# Name, export and import counts and offsets (UE4 4.22 format)
+_TABLES = struct.Struct('<iiiiii')
+_TABLES_OFFSET = 41
+
+
+def _name_hash(name: str) -> int:
+    """Simple hash (FNV-1a style, simplified) of the lower-cased name"""
+    # ASCII names are folded and iterated as bytes, which skips the str.lower()
+    # copy and an ord() call per character
+    if name.isascii():
+        codes = name.encode('ascii').lower()
+    else:
+        codes = map(ord, name.lower())
+    hash_val = 0
+    for c in codes:
+        hash_val = ((hash_val ^ c) * 0x01000193) & 0xFFFFFFFF
+    return hash_val
+
+
+def _map_file(path: Path) -> mmap.mmap | None:
+    """Map a file read-only, or return None for an empty file"""
+    with open(path, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files can't be mapped
+            return None
+
+
+def read_header(buf) -> tuple[int, int, int, int, int, int]:
+    """Verify the magic and return the name, export and import counts and offsets"""
+    magic = _U32.unpack_from(buf, 0)[0]
+    if magic != 0x9E2A83C1:
+        raise ValueError(f"Invalid uasset magic: {hex(magic)}")
+    return _TABLES.unpack_from(buf, _TABLES_OFFSET)
+
+
+def _parse_ascii_names(buf, name_offset: int, name_count: int) -> tuple[list[str], int] | None:
+    """
+    Fast path for the usual all-ASCII name table: the entries are sliced out
+    of the buffer and decoded in one go. Returns None on anything else (a
+    UTF-16 or empty entry, non-ASCII bytes, a missing or extra null, a
+    truncated entry) so the caller can take the general walk.
+    """
+    parts = []
+    append = parts.append
+    buf_len = len(buf)
+    unpack_i32 = _I32.unpack_from
+    pos = name_offset
+
+    for i in range(name_count):
+        if pos >= buf_len:
+            break
+
+        str_len = unpack_i32(buf, pos)[0]
+        if str_len <= 0:
+            return None
+        if str_len > 10000:  # Sanity check
+            pos += 4
+            break
+
+        pos += 4
+        end = pos + str_len
+        if end > buf_len:
+            return None
+
+        append(buf[pos:end])
+        pos = end + 4  # Skip hash (4 bytes)
+
+    joined = b''.join(parts)
+    if not joined.isascii():
+        return None
+    names = joined.decode('ascii').split('\x00')
+    # Each entry must hold exactly one null, as its last byte
+    if names.pop() != '' or any(len(p) - len(n) != 1 for p, n in zip(parts, names)):
+        return None
+    return names, pos
+
+
+def parse_name_table(buf, name_offset: int, name_count: int) -> tuple[list[str], int]:
+    """Parse the name table, returning the names and the offset just past it"""
+    parsed = _parse_ascii_names(buf, name_offset, name_count)
+    if parsed is not None:
+        return parsed
+
+    names = []
+    pos = name_offset
+
+    for i in range(name_count):
+        if pos >= len(buf):
+            break
+
+        # Read string length
+        str_len = _I32.unpack_from(buf, pos)[0]
+        pos += 4
+
+        # Handle UTF-16 strings (negative length)
+        is_utf16 = False
+        if str_len < 0:
+            is_utf16 = True
+            str_len = -str_len
+
+        if str_len > 10000:  # Sanity check
+            break
+
+        # Read string
+        if is_utf16:
+            name = str(buf[pos:pos + str_len * 2], 'utf-16-le', 'ignore').rstrip('\x00')
+            pos += str_len * 2
+        else:
+            name = str(buf[pos:pos + str_len], 'utf-8', 'ignore').rstrip('\x00')
+            pos += str_len
+
+        names.append(name)
+
+        # Skip hash (4 bytes) - only for case-insensitive
+        # For UE4.22+, there's also case preserving hash
+        pos += 4  # Non-case-preserving hash
+
+    return names, pos
+
+
+def _write_file(path: Path, data):
+    """Write data to path via a temporary file, so a failed save never leaves a truncated asset"""
+    tmp = f"{path}.tmp"
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            with memoryview(data) as view:
+                pos = 0
+                while pos < len(view):
+                    pos += os.write(fd, view[pos:])
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _fast_backup(src: Path, dst: Path):
+    """Snapshot src at dst, as a hard link when the filesystem allows it"""
+    # The patcher never writes to its source files, so sharing the data is safe
+    try:
+        dst.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
 
 @dataclass
 class UAssetHeader:
     """UE4 Asset Header Structure"""
+    # Spelled out rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ('magic', 'legacy_version', 'legacy_ue3_version', 'file_version_ue4',
+                 'file_version_licensee', 'custom_version_count', 'total_header_size',
+                 'folder_name_len', 'folder_name', 'package_flags', 'name_count',
+                 'name_offset', 'gatherable_text_data_count',
+                 'gatherable_text_data_offset', 'export_count', 'export_offset',
+                 'import_count', 'import_offset', 'depends_offset',
+                 'soft_package_references_count', 'soft_package_references_offset',
+                 'searchable_names_offset', 'thumbnail_table_offset', 'guid',
+                 'generations', 'saved_by_engine_version',
+                 'compatible_with_engine_version', 'compression_flags',
+                 'compressed_chunks', 'package_source', 'additional_packages',
+                 'asset_registry_data_offset', 'bulk_data_start_offset',
+                 'world_tile_info_data_offset', 'chunk_ids',
+                 'preload_dependency_count', 'preload_dependency_offset')
+
     magic: int  # 0x9E2A83C1
     legacy_version: int
     legacy_ue3_version: int
@@ -67,54 +243,57 @@ class UAssetHeader:
 class UAssetParser:
     """Parser for UE4 .uasset files"""
 
-    def __init__(self, uasset_path: Path, uexp_path: Optional[Path] = None):
+    def __init__(self, uasset_path: Path, uexp_path: Path | None = None, parse_exports: bool = False):
         self.uasset_path = uasset_path
         self.uexp_path = uexp_path
 
-        with open(uasset_path, 'rb') as f:
-            self.uasset_data = bytearray(f.read())
+        # Parsing reads straight from a read-only mapping of the file; the
+        # writable uasset_data buffer is only built once the asset changes
+        self._mm = _map_file(uasset_path)
+        self.uasset_data: bytearray | None = None
+        self._mv = memoryview(self._mm if self._mm is not None else b'')
 
         self.uexp_data = None
         if uexp_path and uexp_path.exists():
             with open(uexp_path, 'rb') as f:
                 self.uexp_data = bytearray(f.read())
 
-        self.names: List[str] = []
-        self.imports: List[dict] = []
-        self.exports: List[dict] = []
+        self.names: list[str] = []
+        self._name_idx: dict[str, int] = {}  # First index of each name, case-sensitive
+        self.imports: list[dict] = []
+        self._exports: list[dict] | None = None
         self._parse()
+        if parse_exports:
+            self._parse_exports()
 
-    def _read_int32(self, data: bytes, offset: int) -> int:
-        return struct.unpack('<i', data[offset:offset + 4])[0]
+        # New entries are staged here and spliced in by flush()
+        self._pending_names: list[bytes] = []
+        self._pending_imports: list[bytes] = []
+        self._name_splice = self.name_table_end
+        self._import_splice = self.import_table_end
 
-    def _read_uint32(self, data: bytes, offset: int) -> int:
-        return struct.unpack('<I', data[offset:offset + 4])[0]
+    def _set_data(self, data: bytearray):
+        """Switch from the file mapping to a writable in-memory buffer"""
+        self._mv.release()
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self.uasset_data = data
+        self._mv = memoryview(data)
 
-    def _read_int64(self, data: bytes, offset: int) -> int:
-        return struct.unpack('<q', data[offset:offset + 8])[0]
+    def _read_int32(self, offset: int) -> int:
+        return _I32.unpack_from(self._mv, offset)[0]
 
-    def _write_int32(self, data: bytearray, offset: int, value: int):
-        data[offset:offset + 4] = struct.pack('<i', value)
+    def _read_uint32(self, offset: int) -> int:
+        return _U32.unpack_from(self._mv, offset)[0]
 
-    def _write_uint32(self, data: bytearray, offset: int, value: int):
-        data[offset:offset + 4] = struct.pack('<I', value)
+    def _read_int64(self, offset: int) -> int:
+        return _I64.unpack_from(self._mv, offset)[0]
 
     def _parse(self):
         """Parse the uasset header and tables"""
-        data = self.uasset_data
-
-        # Verify magic
-        magic = self._read_uint32(data, 0)
-        if magic != 0x9E2A83C1:
-            raise ValueError(f"Invalid uasset magic: {hex(magic)}")
-
-        # Parse key offsets (UE4 4.22 format)
-        self.name_count = self._read_int32(data, 41)
-        self.name_offset = self._read_int32(data, 45)
-        self.export_count = self._read_int32(data, 49)
-        self.export_offset = self._read_int32(data, 53)
-        self.import_count = self._read_int32(data, 57)
-        self.import_offset = self._read_int32(data, 61)
+        (self.name_count, self.name_offset, self.export_count, self.export_offset,
+         self.import_count, self.import_offset) = read_header(self._mv)
 
         # Parse name table
         self._parse_names()
@@ -122,188 +301,164 @@ class UAssetParser:
         # Parse import table
         self._parse_imports()
 
-        # Parse export table
-        self._parse_exports()
+        # The export table is parsed on first use of self.exports
 
     def _parse_names(self):
         """Parse the name table"""
-        data = self.uasset_data
-        pos = self.name_offset
-
-        for i in range(self.name_count):
-            if pos >= len(data):
-                break
-
-            # Read string length
-            str_len = self._read_int32(data, pos)
-            pos += 4
-
-            # Handle UTF-16 strings (negative length)
-            is_utf16 = False
-            if str_len < 0:
-                is_utf16 = True
-                str_len = -str_len
-
-            if str_len > 10000:  # Sanity check
-                break
-
-            # Read string
-            if is_utf16:
-                name = data[pos:pos + str_len * 2].decode('utf-16-le', errors='ignore').rstrip('\x00')
-                pos += str_len * 2
-            else:
-                name = data[pos:pos + str_len].decode('utf-8', errors='ignore').rstrip('\x00')
-                pos += str_len
-
-            self.names.append(name)
-
-            # Skip hash (4 bytes) - only for case-insensitive
-            # For UE4.22+, there's also case preserving hash
-            pos += 4  # Non-case-preserving hash
-
-        self.name_table_end = pos
+        self.names, self.name_table_end = parse_name_table(self._mv, self.name_offset, self.name_count)
+        for i, name in enumerate(self.names):
+            self._name_idx.setdefault(name, i)
+
+    @classmethod
+    def verify_names(cls, path: Path, wanted: list[str]) -> tuple[int, int, dict[str, bool]]:
+        """
+        Check which of the wanted names an asset contains, reading only its
+        header and name table. Returns (name count, import count, found).
+        """
+        mm = _map_file(path)
+        try:
+            with memoryview(mm if mm is not None else b'') as mv:
+                name_count, name_offset, _, _, import_count, _ = read_header(mv)
+                names = set(parse_name_table(mv, name_offset, name_count)[0])
+        finally:
+            if mm is not None:
+                mm.close()
+        return name_count, import_count, {name: name in names for name in wanted}
+
+    @staticmethod
+    def quick_has_name(path: Path, name: str) -> bool:
+        """
+        Check whether an asset's name table has a name by searching the raw
+        file for its serialized entry, without parsing anything
+        """
+        if name.isascii():
+            entry = _I32.pack(len(name) + 1) + name.encode('ascii') + b'\x00'
+        else:
+            encoded = name.encode('utf-16-le') + b'\x00\x00'
+            entry = _I32.pack(-(len(encoded) // 2)) + encoded
+
+        mm = _map_file(path)
+        if mm is None:
+            return False
+        with mm:
+            return mm.find(entry) != -1
+
+    def _table_entries(self, table: struct.Struct, offset: int, count: int):
+        """Iterate the whole entries of a fixed-size table that fit in the file"""
+        if offset < 0 and count > 0:
+            raise ValueError(f"Invalid table offset: {offset}")
+        count = max(0, min(count, (len(self._mv) - offset) // table.size))
+        return table.iter_unpack(self._mv[offset:offset + count * table.size])
 
     def _parse_imports(self):
         """Parse the import table"""
-        data = self.uasset_data
+        names = self.names
+        name_count = len(names)
         pos = self.import_offset
 
-        for i in range(self.import_count):
-            if pos + 28 > len(data):
-                break
-
-            imp = {
-                'class_package_idx': self._read_int64(data, pos),
-                'class_name_idx': self._read_int64(data, pos + 8),
-                'outer_index': self._read_int32(data, pos + 16),
-                'object_name_idx': self._read_int32(data, pos + 20),
-                'offset': pos
-            }
-
-            # Resolve names
-            cp_idx = imp['class_package_idx']
-            cn_idx = imp['class_name_idx']
-            on_idx = imp['object_name_idx']
-
-            imp['class_package'] = self.names[cp_idx] if 0 <= cp_idx < len(self.names) else f"idx_{cp_idx}"
-            imp['class_name'] = self.names[cn_idx] if 0 <= cn_idx < len(self.names) else f"idx_{cn_idx}"
-            imp['object_name'] = self.names[on_idx] if 0 <= on_idx < len(self.names) else f"idx_{on_idx}"
-
-            self.imports.append(imp)
+        for cp_idx, cn_idx, outer_index, on_idx in self._table_entries(_IMPORT, pos, self.import_count):
+            self.imports.append({
+                'class_package_idx': cp_idx,
+                'class_name_idx': cn_idx,
+                'outer_index': outer_index,
+                'object_name_idx': on_idx,
+                'offset': pos,
+                'class_package': names[cp_idx] if 0 <= cp_idx < name_count else f"idx_{cp_idx}",
+                'class_name': names[cn_idx] if 0 <= cn_idx < name_count else f"idx_{cn_idx}",
+                'object_name': names[on_idx] if 0 <= on_idx < name_count else f"idx_{on_idx}"
+            })
             pos += 28
 
         self.import_table_end = pos
 
+    @property
+    def exports(self) -> list[dict]:
+        if self._exports is None:
+            self._parse_exports()
+        return self._exports
+
     def _parse_exports(self):
         """Parse the export table (partial - just for reference)"""
-        data = self.uasset_data
+        exports = []
+        names = self.names
+        name_count = len(names)
         pos = self.export_offset
 
         # Export entries are variable size in UE4, this is simplified
-        for i in range(min(self.export_count, 100)):
-            if pos + 104 > len(data):  # Minimum export entry size
-                break
-
-            exp = {
-                'class_index': self._read_int32(data, pos),
-                'super_index': self._read_int32(data, pos + 4),
-                'template_index': self._read_int32(data, pos + 8),
-                'outer_index': self._read_int32(data, pos + 12),
-                'object_name_idx': self._read_int32(data, pos + 16),
-                'object_flags': self._read_uint32(data, pos + 20),
-                'serial_size': self._read_int64(data, pos + 24),
-                'serial_offset': self._read_int64(data, pos + 32),
-                'offset': pos
-            }
-
-            on_idx = exp['object_name_idx']
-            exp['object_name'] = self.names[on_idx] if 0 <= on_idx < len(self.names) else f"idx_{on_idx}"
-
-            self.exports.append(exp)
+        entries = self._table_entries(_EXPORT, pos, min(self.export_count, 100))
+        for class_idx, super_idx, template_idx, outer_index, on_idx, flags, serial_size, serial_offset in entries:
+            exports.append({
+                'class_index': class_idx,
+                'super_index': super_idx,
+                'template_index': template_idx,
+                'outer_index': outer_index,
+                'object_name_idx': on_idx,
+                'object_flags': flags,
+                'serial_size': serial_size,
+                'serial_offset': serial_offset,
+                'offset': pos,
+                'object_name': names[on_idx] if 0 <= on_idx < name_count else f"idx_{on_idx}"
+            })
             pos += 104  # This is approximate, actual size varies
 
+        self._exports = exports
+
     def find_name_index(self, name: str) -> int:
         """Find the index of a name in the name table"""
-        try:
-            return self.names.index(name)
-        except ValueError:
-            return -1
+        return self._name_idx.get(name, -1)
 
     def add_name(self, name: str) -> int:
         """Add a new name to the name table and return its index"""
-        existing = self.find_name_index(name)
-        if existing >= 0:
-            return existing
+        return self.add_names([name])[0]
+
+    def add_names(self, names: list[str]) -> list[int]:
+        """Add several names to the name table and return their indices"""
+        indices = []
+        entries = []
+        for name in names:
+            existing = self.find_name_index(name)
+            if existing >= 0:
+                indices.append(existing)
+                continue
+
+            # Names are stored as: length (4 bytes) + string (with null) + hash (4 bytes)
+            name_bytes = name.encode('utf-8') + b'\x00'
+            entries.append(_U32.pack(len(name_bytes)) + name_bytes + _U32.pack(_name_hash(name)))
 
-        # Calculate where to insert the new name
-        # Names are stored as: length (4 bytes) + string (with null) + hash (4 bytes)
-
-        # Create the name entry bytes
-        name_bytes = name.encode('utf-8') + b'\x00'
-        name_len = len(name_bytes)
-
-        # Simple hash (FNV-1a style, simplified)
-        hash_val = 0
-        for c in name.lower():
-            hash_val = ((hash_val ^ ord(c)) * 0x01000193) & 0xFFFFFFFF
-
-        # Build the entry
-        entry = struct.pack('<I', name_len) + name_bytes + struct.pack('<I', hash_val)
-
-        # Insert at the end of the name table
-        insert_pos = self.name_table_end
-        self.uasset_data[insert_pos:insert_pos] = entry
-
-        # Update counts and offsets
-        self.names.append(name)
-        new_idx = len(self.names) - 1
-        self.name_count += 1
-        self.name_table_end += len(entry)
-
-        # Update header
-        self._write_int32(self.uasset_data, 41, self.name_count)
-
-        # Shift all offsets that come after the name table
-        shift_amount = len(entry)
-        self._shift_offsets_after(insert_pos, shift_amount)
-
-        return new_idx
-
-    def _shift_offsets_after(self, position: int, amount: int):
-        """Shift all offsets that point to data after the given position"""
-        # This is a simplified version - in practice, more offsets need updating
+            self.names.append(name)
+            new_idx = len(self.names) - 1
+            self._name_idx[name] = new_idx
+            indices.append(new_idx)
 
-        # Update export offset if needed
-        if self.export_offset > position:
-            self.export_offset += amount
-            self._write_int32(self.uasset_data, 53, self.export_offset)
+        # Stage the entries at the end of the name table and update the
+        # counts and the would-be table ends
+        added = sum(map(len, entries))
+        self._pending_names.extend(entries)
+        self.name_count += len(entries)
+        self.name_table_end += added
+        if self._import_splice >= self._name_splice:
+            self.import_table_end += added
 
-        # Update import offset if needed
-        if self.import_offset > position:
-            self.import_offset += amount
-            self._write_int32(self.uasset_data, 61, self.import_offset)
+        return indices
 
     def add_import(self, class_package: str, class_name: str, object_name: str, outer_index: int = 0) -> int:
         """Add a new import entry"""
         # First, ensure the names exist
-        cp_idx = self.add_name(class_package)
-        cn_idx = self.add_name(class_name)
-        on_idx = self.add_name(object_name)
-
-        # Create the import entry (28 bytes)
-        entry = struct.pack('<q', cp_idx)  # class_package_idx (8 bytes)
-        entry += struct.pack('<q', cn_idx)  # class_name_idx (8 bytes)
-        entry += struct.pack('<i', outer_index)  # outer_index (4 bytes)
-        entry += struct.pack('<i', on_idx)  # object_name_idx (4 bytes)
-        entry += struct.pack('<i', 0)  # padding/additional (4 bytes)
-
-        # Insert at the end of the import table
+        cp_idx, cn_idx, on_idx = self.add_names([class_package, class_name, object_name])
+
+        # Create the import entry (28 bytes): class_package_idx (8 bytes),
+        # class_name_idx (8 bytes), outer_index (4 bytes), object_name_idx
+        # (4 bytes) and zeroed padding/additional (4 bytes)
+        entry = _IMPORT.pack(cp_idx, cn_idx, outer_index, on_idx)
+
+        # Stage it at the end of the import table
         insert_pos = self.import_table_end
-        self.uasset_data[insert_pos:insert_pos] = entry
+        self._pending_imports.append(entry)
 
         # Update count
         self.import_count += 1
-        self._write_int32(self.uasset_data, 57, self.import_count)
+        if self._name_splice > self._import_splice:
+            self.name_table_end += len(entry)
 
         # Track the new import
         new_import = {
@@ -322,14 +477,55 @@ class UAssetParser:
         # Return negative index (imports are referenced with negative indices)
         return -(len(self.imports))
 
-    def save(self, output_uasset: Path, output_uexp: Optional[Path] = None):
+    def flush(self):
+        """Splice the staged names and imports into the asset in one pass"""
+        if not self._pending_names and not self._pending_imports:
+            return
+
+        name_blob = b''.join(self._pending_names)
+        import_blob = b''.join(self._pending_imports)
+        splices = sorted([(self._name_splice, name_blob), (self._import_splice, import_blob)],
+                         key=lambda splice: splice[0])
+        (pos1, blob1), (pos2, blob2) = splices
+
+        mv = self._mv
+        data = bytearray().join((mv[:pos1], blob1, mv[pos1:pos2], blob2, mv[pos2:]))
+        del mv
+        self._set_data(data)
+
+        # Tables that start at or after a splice point move with it
+        export_offset = self.export_offset
+        if self.import_offset >= self._name_splice:
+            self.import_offset += len(name_blob)
+        if export_offset >= self._name_splice:
+            self.export_offset += len(name_blob)
+        if export_offset >= self._import_splice:
+            self.export_offset += len(import_blob)
+
+        # Rewrite the table counts and offsets in place
+        _TABLES.pack_into(self.uasset_data, _TABLES_OFFSET, self.name_count, self.name_offset,
+                          self.export_count, self.export_offset, self.import_count, self.import_offset)
+
+        self._pending_names.clear()
+        self._pending_imports.clear()
+        self._name_splice = self.name_table_end
+        self._import_splice = self.import_table_end
+
+    def save(self, output_uasset: Path, output_uexp: Path | None = None):
         """Save the modified asset"""
-        with open(output_uasset, 'wb') as f:
-            f.write(self.uasset_data)
+        self.flush()
+
+        if self.uasset_data is None:
+            # Nothing was changed, so the source file is the output
+            try:
+                shutil.copyfile(self.uasset_path, output_uasset)
+            except shutil.SameFileError:
+                pass
+        else:
+            _write_file(output_uasset, self.uasset_data)
 
         if self.uexp_data and output_uexp:
-            with open(output_uexp, 'wb') as f:
-                f.write(self.uexp_data)
+            _write_file(output_uexp, self.uexp_data)
 
     def print_summary(self):
         """Print a summary of the asset"""
@@ -366,24 +562,25 @@ def patch_inventory_for_sorting():
     out_uasset = out_dir / "UMG_InventoryHUD.uasset"
     out_uexp = out_dir / "UMG_InventoryHUD.uexp"
 
+    # Check if already patched
+    if UAssetParser.quick_has_name(inv_uasset, 'UMG_SortSelectionPicker_C'):
+        print("\n[!] Asset already contains sort picker reference - already patched, nothing to do")
+        return True
+
     # Make a backup copy first
     print("\n[1] Creating backup and loading asset...")
-    shutil.copy2(inv_uasset, out_dir / "UMG_InventoryHUD.uasset.backup")
-    shutil.copy2(inv_uexp, out_dir / "UMG_InventoryHUD.uexp.backup")
+    _fast_backup(inv_uasset, out_dir / "UMG_InventoryHUD.uasset.backup")
+    _fast_backup(inv_uexp, out_dir / "UMG_InventoryHUD.uexp.backup")
 
     # Parse the inventory HUD
     try:
-        parser = UAssetParser(inv_uasset, inv_uexp)
+        parser = UAssetParser(inv_uasset, inv_uexp, parse_exports=False)
         print(f"    Loaded: {inv_uasset.name}")
         print(f"    Names: {parser.name_count}, Imports: {parser.import_count}, Exports: {parser.export_count}")
     except Exception as e:
         print(f"    Error parsing asset: {e}")
         return False
 
-    # Check if already patched
-    if parser.find_name_index('UMG_SortSelectionPicker_C') >= 0:
-        print("\n[!] Asset already contains sort picker reference - may already be patched")
-
     # Add the required names for sorting
     print("\n[2] Adding sorting-related names...")
     names_to_add = [
@@ -402,8 +599,7 @@ def patch_inventory_for_sorting():
         'CurrentSortMethod'
     ]
 
-    for name in names_to_add:
-        idx = parser.add_name(name)
+    for idx, name in zip(parser.add_names(names_to_add), names_to_add):
         print(f"    Added/Found name [{idx}]: {name}")
 
     # Add import for the sort picker widget class
@@ -428,14 +624,13 @@ def patch_inventory_for_sorting():
     # Verify the changes
     print("\n[5] Verifying changes...")
     try:
-        verify_parser = UAssetParser(out_uasset, out_uexp)
-        print(f"    New name count: {verify_parser.name_count}")
-        print(f"    New import count: {verify_parser.import_count}")
+        name_count, import_count, found = UAssetParser.verify_names(out_uasset, names_to_add[:3])
+        print(f"    New name count: {name_count}")
+        print(f"    New import count: {import_count}")
 
         # Check for our added names
-        for name in names_to_add[:3]:
-            idx = verify_parser.find_name_index(name)
-            status = "✓" if idx >= 0 else "✗"
+        for name, present in found.items():
+            status = "✓" if present else "✗"
             print(f"    {status} {name}")
     except Exception as e:
         print(f"    Warning: Verification failed: {e}")